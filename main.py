@@ -1,13 +1,24 @@
 import argparse
 import json
 import os
-
-from utils import USER_STYLE_PREFIX, Agent, PrintStyle
+import sys
+
+from styles import (
+    BRIGHT_CYAN,
+    BRIGHT_RED,
+    CYAN,
+    GRAY,
+    RESET,
+    USER_STYLE_PREFIX,
+)
 
 DEFAULTS_FILE = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "defaults.json")
 )
 
+# Parsed defaults file, keyed by its modification time and size
+_defaults_cache = {}
+
 AVAILABLE_MODELS = [
     "gpt-4o",
     "gpt-4o-2024-08-06",
@@ -43,6 +54,12 @@ def create_argument_parser():
         action="store_true",
         help="Automatically allow all tools and commands (use with caution)",
     )
+    parser.add_argument(
+        "--cache",
+        "-c",
+        action="store_true",
+        help="Reuse cached responses to repeated requests (plain answers only, kept for a day)",
+    )
     parser.add_argument(
         "--save-defaults",
         "-S",
@@ -74,12 +91,39 @@ def create_argument_parser():
     return parser
 
 
+def sniff_show_models(argv):
+    """
+    Check whether the command line asks for the model list without needing a full parse.
+
+    Args:
+        argv (list): Command-line arguments, excluding the program name.
+
+    Returns:
+        bool: True if --show-models was passed and help was not requested.
+    """
+    return "--show-models" in argv and "-h" not in argv and "--help" not in argv
+
+
+def print_available_models():
+    """Print the list of available AI models."""
+    print("Available AI models:")
+    for model in AVAILABLE_MODELS:
+        print(f"- {model}")
+
+
 def load_defaults():
-    """Load default values from the defaults file."""
-    if os.path.exists(DEFAULTS_FILE):
+    """Load default values from the defaults file, reusing the last parse if unchanged."""
+    try:
+        stat = os.stat(DEFAULTS_FILE)
+    except FileNotFoundError:
+        return {}
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _defaults_cache.get("key") != key:
         with open(DEFAULTS_FILE, "r") as f:
-            return json.load(f)
-    return {}
+            _defaults_cache["value"] = json.load(f)
+        _defaults_cache["key"] = key
+    return _defaults_cache["value"]
 
 
 def save_defaults(flags):
@@ -98,11 +142,14 @@ def initialize_agent(args):
     Returns:
         Agent: Configured Agent instance.
     """
+    from utils import Agent
+
     return Agent(
         model=args.model,
         use_memory=args.memory,
         view_list_dir=args.ls,
         always_allow=args.always_allow,
+        use_cache=args.cache,
     )
 
 
@@ -129,26 +176,29 @@ def print_ascii_art():
  / ___ \ | |    | | | |___|  _ <| |  | || || |\  |/ ___ \| |___ 
 /_/   \_\___|   |_| |_____|_| \_\_|  |_|___|_| \_/_/   \_\_____|
 """
-    print(f"{PrintStyle.BRIGHT_CYAN.value}{ascii_art}{PrintStyle.RESET.value}")
+    print(f"{BRIGHT_CYAN}{ascii_art}{RESET}")
 
 
 def main():
     """
     Main function to run the chat application.
     """
+    # Skip building the full parser when only the model list was requested
+    if sniff_show_models(sys.argv[1:]):
+        print_available_models()
+        return
+
     parser = create_argument_parser()
     args = parser.parse_args()
 
     if args.show_models:
-        print("Available AI models:")
-        for model in AVAILABLE_MODELS:
-            print(f"- {model}")
+        print_available_models()
         return
 
     defaults = load_defaults()
 
     # Apply defaults if they exist and flags are not explicitly set
-    for flag in ["memory", "ls", "always_allow", "model", "hide_splash"]:
+    for flag in ["memory", "ls", "always_allow", "cache", "model", "hide_splash"]:
         if flag in defaults and not getattr(args, flag):
             setattr(args, flag, defaults[flag])
 
@@ -159,39 +209,41 @@ def main():
     if args.reset_defaults:
         if os.path.exists(DEFAULTS_FILE):
             os.remove(DEFAULTS_FILE)
-        print(
-            f"{PrintStyle.BRIGHT_CYAN.value}Defaults have been reset.{PrintStyle.RESET.value}"
-        )
+        print(f"{BRIGHT_CYAN}Defaults have been reset.{RESET}")
 
     if args.save_defaults:
         current_flags = {
             "memory": args.memory,
             "ls": args.ls,
             "always_allow": args.always_allow,
+            "cache": args.cache,
             "model": args.model,
             "hide_splash": args.hide_splash,
         }
         save_defaults(current_flags)
-        print(
-            f"{PrintStyle.BRIGHT_CYAN.value}Defaults have been set to current flags.{PrintStyle.RESET.value}"
-        )
+        print(f"{BRIGHT_CYAN}Defaults have been set to current flags.{RESET}")
+
+    # Nothing left to do when only the defaults were changed
+    if not args.query and (args.reset_defaults or args.save_defaults):
+        return
 
     if not args.hide_splash:
         # Print ASCII art and current settings
         print_ascii_art()
+        print(f"{CYAN}         Model  {RESET}{args.model}")
         print(
-            f"{PrintStyle.CYAN.value}         Model  {PrintStyle.RESET.value}{args.model}"
+            f"{CYAN}        Memory  {f'{RESET}Enabled' if args.memory else f'{GRAY}Disabled'}"
         )
         print(
-            f"{PrintStyle.CYAN.value}        Memory  {f'{PrintStyle.RESET.value}Enabled' if args.memory else f'{PrintStyle.GRAY.value}Disabled'}"
+            f"{CYAN}List Directory  {f'{RESET}Enabled' if args.ls else f'{GRAY}Disabled'}"
         )
         print(
-            f"{PrintStyle.CYAN.value}List Directory  {f'{PrintStyle.RESET.value}Enabled' if args.ls else f'{PrintStyle.GRAY.value}Disabled'}"
+            f"{CYAN}  Always Allow  {f'{RESET}Enabled' if args.always_allow else f'{GRAY}Disabled'}"
         )
         print(
-            f"{PrintStyle.CYAN.value}  Always Allow  {f'{PrintStyle.RESET.value}Enabled' if args.always_allow else f'{PrintStyle.GRAY.value}Disabled'}"
+            f"{CYAN}Response Cache  {f'{RESET}Enabled' if args.cache else f'{GRAY}Disabled'}"
         )
-        print(PrintStyle.RESET.value)
+        print(RESET)
 
     has_initial_query = bool(args.query)
     agent = initialize_agent(args)
@@ -201,14 +253,14 @@ def main():
             if has_initial_query:
                 # If an initial query was provided, use it as the first query
                 query = " ".join(args.query)
-                print(f"{USER_STYLE_PREFIX}> {query}{PrintStyle.RESET.value}")
+                print(f"{USER_STYLE_PREFIX}> {query}{RESET}")
                 has_initial_query = False
             else:
                 # Prompt the user for input
                 query = input(f"{USER_STYLE_PREFIX}> ")
                 if query.lower() in ["exit", "quit"] or query == "":
                     break
-                print(PrintStyle.RESET.value, end="")
+                print(RESET, end="")
 
             # Handle the user's query
             handle_query(agent, query)
@@ -219,15 +271,17 @@ def main():
             print("\033[K", end="")
             break
 
+        except EOFError:
+            # Exit at the end of input (e.g. Ctrl+D or the end of piped queries)
+            break
+
         except Exception as e:
             # Handle any other exceptions
-            print(
-                f"{PrintStyle.BRIGHT_RED.value}⚠ Error getting response: {e}{PrintStyle.RESET.value}"
-            )
+            print(f"{BRIGHT_RED}⚠ Error getting response: {e}{RESET}")
             continue
 
     # Clear any styles before exiting
-    print(PrintStyle.RESET.value, end="")
+    print(RESET, end="")
 
 
 if __name__ == "__main__":
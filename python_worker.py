@@ -0,0 +1,188 @@
+"""
+Long-lived Python process used by the python_executor tool.
+
+Reads one JSON request per line from stdin ({"code": "..."}), runs the code in a
+fresh namespace and writes one JSON response per line to stdout
+({"output": "...", "success": true}).
+"""
+
+import builtins
+import json
+import os
+import sys
+import tempfile
+import threading
+import traceback
+
+# Libraries the python_executor tool advertises, imported ahead of time so the code
+# that uses them doesn't pay for the import
+WARM_MODULES = ("numpy", "matplotlib.pyplot", "pypdf", "PIL.Image")
+# Top-level package names; code mentioning one waits for the imports to finish first
+WARM_PACKAGES = tuple(module.split(".")[0] for module in WARM_MODULES)
+
+
+def warm_up():
+    """
+    Imports the commonly used libraries that are installed.
+    """
+    for module in WARM_MODULES:
+        try:
+            __import__(module)
+        except Exception:
+            pass
+
+
+def save_state():
+    """
+    Records the interpreter state that the code being run is likely to change.
+
+    Returns:
+        dict: The saved state, for restore_state().
+    """
+    return {
+        "builtins": dict(vars(builtins)),
+        "streams": (sys.stdin, sys.stdout, sys.stderr),
+        "path": list(sys.path),
+        "argv": list(sys.argv),
+        "environ": dict(os.environ),
+        "cwd": os.getcwd(),
+    }
+
+
+def restore_state(state):
+    """
+    Puts back the interpreter state recorded by save_state().
+
+    Args:
+        state (dict): The state returned by save_state().
+    """
+    # Put the saved builtins back before anything else looks one up
+    builtins_dict = vars(builtins)
+    builtins_dict.update(state["builtins"])
+    for name in [name for name in builtins_dict if name not in state["builtins"]]:
+        del builtins_dict[name]
+
+    sys.stdin, sys.stdout, sys.stderr = state["streams"]
+    sys.path[:] = state["path"]
+    sys.argv[:] = state["argv"]
+    if dict(os.environ) != state["environ"]:
+        os.environ.clear()
+        os.environ.update(state["environ"])
+    os.chdir(state["cwd"])
+
+
+def run_code(code):
+    """
+    Executes Python code, capturing everything written to stdout and stderr.
+
+    Output is captured at the file descriptor level so that subprocesses started
+    by the code are captured too. Afterwards the builtins, standard streams,
+    sys.path, sys.argv, environment variables and working directory are put back,
+    so one run can't break the next. Changes to imported modules are kept.
+
+    Args:
+        code (str): The Python code to execute.
+
+    Returns:
+        tuple: The captured output (str) and whether the code ran without error (bool).
+    """
+    success = True
+    error = None
+    state = save_state()
+    threads_before = set(threading.enumerate())
+    with tempfile.TemporaryFile() as capture:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_stdout = os.dup(1)
+        saved_stderr = os.dup(2)
+        os.dup2(capture.fileno(), 1)
+        os.dup2(capture.fileno(), 2)
+        try:
+            try:
+                exec(compile(code, "<string>", "exec"), {"__name__": "__main__"})
+            except BaseException as e:
+                error = e
+            finally:
+                # Like the interpreter at exit, wait for the threads the code started
+                # so their output is captured with the rest
+                for thread in threading.enumerate():
+                    if thread not in threads_before and not thread.daemon:
+                        thread.join()
+                # Flush whatever the code left in its streams before replacing them
+                for stream in (sys.stdout, sys.stderr):
+                    try:
+                        stream.flush()
+                    except Exception:
+                        pass
+                restore_state(state)
+
+            # Errors are reported with the restored streams and builtins
+            if isinstance(error, SystemExit):
+                # Mirror the interpreter: only a code of None or 0 is a clean exit
+                if isinstance(error.code, int):
+                    success = error.code == 0
+                elif error.code is not None:
+                    print(error.code, file=sys.stderr)
+                    success = False
+            elif error is not None:
+                # Skip this function's frame so the traceback starts at the user's code
+                traceback.print_exception(
+                    type(error), error, error.__traceback__.tb_next
+                )
+                success = False
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_stdout, 1)
+            os.dup2(saved_stderr, 2)
+            os.close(saved_stdout)
+            os.close(saved_stderr)
+            # Don't let figures left open by one run leak into the next
+            # (pyplot may still be mid-import by warm_up, so skip it until the import finished)
+            pyplot = sys.modules.get("matplotlib.pyplot")
+            spec = getattr(pyplot, "__spec__", None)
+            if pyplot is not None and not getattr(spec, "_initializing", False):
+                pyplot.close("all")
+        capture.seek(0)
+        output = capture.read().decode("utf-8", "replace")
+    return output, success
+
+
+def main():
+    """
+    Serves code execution requests until stdin is closed.
+    """
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    responses = os.fdopen(os.dup(1), "w", encoding="utf-8")
+
+    # The code being run must not read the requests or write into the responses, even
+    # from a thread that outlives its run, so point stdin and stdout at devnull
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    # Import in the background while waiting for the first request. Code using one of
+    # these libraries waits for the imports to finish so it never sees a partially
+    # imported module, while other code runs right away.
+    warmer = threading.Thread(target=warm_up, daemon=True)
+    warmer.start()
+
+    # Bound up front so code replacing these module attributes can't break the protocol
+    loads, dumps, run, warmed = json.loads, json.dumps, run_code, warmer.join
+    write, flush, packages = responses.write, responses.flush, WARM_PACKAGES
+
+    try:
+        for line in requests:
+            code = loads(line)["code"]
+            if any(package in code for package in packages):
+                warmed()
+            output, success = run(code)
+            write(dumps({"output": output, "success": success}) + "\n")
+            flush()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
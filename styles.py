@@ -0,0 +1,61 @@
+from enum import Enum
+
+# Console text styles as plain strings, so hot paths avoid the Enum attribute lookups
+RED = "\033[31m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+BLUE = "\033[34m"
+MAGENTA = "\033[35m"
+CYAN = "\033[36m"
+GRAY = "\033[90m"
+WHITE = "\033[37m"
+BRIGHT_RED = "\033[91m"
+BRIGHT_GREEN = "\033[92m"
+BRIGHT_YELLOW = "\033[93m"
+BRIGHT_BLUE = "\033[94m"
+BRIGHT_MAGENTA = "\033[95m"
+BRIGHT_CYAN = "\033[96m"
+BRIGHT_GRAY = "\033[90m"
+BRIGHT_WHITE = "\033[97m"
+BOLD = "\033[1m"
+UNDERLINE = "\033[4m"
+INVERT = "\033[7m"
+STRIKETHROUGH = "\033[9m"
+BOLD_END = "\033[21m"
+UNDERLINE_END = "\033[24m"
+INVERT_END = "\033[27m"
+STRIKETHROUGH_END = "\033[29m"
+RESET = "\033[0m"
+
+
+# Enum for console text styles
+class PrintStyle(Enum):
+    RED = RED
+    GREEN = GREEN
+    YELLOW = YELLOW
+    BLUE = BLUE
+    MAGENTA = MAGENTA
+    CYAN = CYAN
+    GRAY = GRAY
+    WHITE = WHITE
+    BRIGHT_RED = BRIGHT_RED
+    BRIGHT_GREEN = BRIGHT_GREEN
+    BRIGHT_YELLOW = BRIGHT_YELLOW
+    BRIGHT_BLUE = BRIGHT_BLUE
+    BRIGHT_MAGENTA = BRIGHT_MAGENTA
+    BRIGHT_CYAN = BRIGHT_CYAN
+    BRIGHT_GRAY = BRIGHT_GRAY
+    BRIGHT_WHITE = BRIGHT_WHITE
+    BOLD = BOLD
+    UNDERLINE = UNDERLINE
+    INVERT = INVERT
+    STRIKETHROUGH = STRIKETHROUGH
+    BOLD_END = BOLD_END
+    UNDERLINE_END = UNDERLINE_END
+    INVERT_END = INVERT_END
+    STRIKETHROUGH_END = STRIKETHROUGH_END
+    RESET = RESET
+
+
+# User's input style prefix
+USER_STYLE_PREFIX = BRIGHT_BLUE
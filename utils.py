@@ -1,24 +1,114 @@
+import atexit
+import functools
+import hashlib
 import json
 import os
 import re
+import sqlite3
+import stat
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from enum import Enum
 from typing import Literal
 
-from anthropic import Anthropic
-from dotenv import load_dotenv
-from openai import OpenAI
+import pathspec
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 
-# Load environment variables from the .env file
-load_dotenv()
+from styles import (
+    BLUE,
+    BOLD,
+    BRIGHT_CYAN,
+    BRIGHT_GREEN,
+    BRIGHT_MAGENTA,
+    BRIGHT_RED,
+    BRIGHT_YELLOW,
+    GREEN,
+    MAGENTA,
+    RED,
+    RESET,
+    WHITE,
+    YELLOW,
+    USER_STYLE_PREFIX,
+    PrintStyle,
+)
+
+try:
+    # orjson parses the large tool call arguments and the memory file much faster,
+    # when installed
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+
+# Public names, including the styles re-exported for callers importing them from here
+__all__ = [
+    "PrintStyle",
+    "USER_STYLE_PREFIX",
+    "MEMORY_FILE",
+    "MAX_CHAT_TOTAL_CONTENT",
+    "RESPONSE_CACHE_FILE",
+    "RESPONSE_CACHE_TTL",
+    "ANTHROPIC_PROMPT_CACHING_HEADERS",
+    "PYTHON_WORKER_SCRIPT",
+    "USER_PLATFORM",
+    "USER_ENV",
+    "USER_CWD",
+    "USER_INFO",
+    "SYSTEM_PROMPT",
+    "SYSTEM_PROMPT_HASH",
+    "load_env",
+    "remove_ansi_escape_sequences",
+    "highlight_code",
+    "load_gitignore_entries",
+    "is_excluded",
+    "get_files_dirs",
+    "get_files_dirs_signature",
+    "get_files_tree",
+    "write_file",
+    "read_file",
+    "load_file",
+    "PythonWorker",
+    "get_python_worker",
+    "run_python_code",
+    "with_cache_breakpoint",
+    "ResponseCache",
+    "StreamPrinter",
+    "Agent",
+    "FILE_WRITER_TOOL",
+    "FILE_READER_TOOL",
+    "PYTHON_EXECUTOR_TOOL",
+    "SAVE_MEMORY_TOOL",
+    "REMOVE_MEMORY_TOOL",
+    "BASE_TOOLS",
+    "MEMORY_TOOLS",
+    "TOOL_REQUIRED_ARGS",
+]
+
 
 # Constants
 MEMORY_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "memory.json"))
 MAX_CHAT_TOTAL_CONTENT = 128000 * 3  # Maximum total content length for all messages
 
+# Opt-in on-disk cache of text-only responses, and how long entries stay valid
+RESPONSE_CACHE_FILE = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "response_cache.sqlite3")
+)
+RESPONSE_CACHE_TTL = 24 * 60 * 60  # Seconds
+
+# Enables prompt caching for the Anthropic API
+ANTHROPIC_PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+# Script run by the long-lived Python process behind the python_executor tool
+PYTHON_WORKER_SCRIPT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "python_worker.py")
+)
+
 # User's platform and environment information
 USER_PLATFORM = sys.platform
 USER_ENV = (
@@ -33,73 +123,76 @@ USER_INFO = f"""User's Information:
 - Current Working Directory: {USER_CWD}
 """
 
+# Instructions given to the AI, the same for every agent in the process
+SYSTEM_PROMPT = (
+    f"Your primary function is to assist the user with tasks related to terminal commands in their respective platform. You can also help with code and other queries. Information about the user's platform, environment, and current working directory is provided below.\n\n{USER_INFO}"
+    + "\n\nTool Calls:\nIf you're asked to perform a task that requires writing to the file system, reading from a file, or executing Python code, use the tool directly to perform the task. Do not ask for permission first. Perform any tasks that require a tool call immediately, without responding to the user first, unless absolutely necessary for clarification."
+)
+# Short, stable digest of the instructions for use in cache keys
+SYSTEM_PROMPT_HASH = hashlib.blake2b(SYSTEM_PROMPT.encode(), digest_size=16).digest()
 
-# Enum for console text styles
-class PrintStyle(Enum):
-    RED = "\033[31m"
-    GREEN = "\033[32m"
-    YELLOW = "\033[33m"
-    BLUE = "\033[34m"
-    MAGENTA = "\033[35m"
-    CYAN = "\033[36m"
-    GRAY = "\033[90m"
-    WHITE = "\033[37m"
-    BRIGHT_RED = "\033[91m"
-    BRIGHT_GREEN = "\033[92m"
-    BRIGHT_YELLOW = "\033[93m"
-    BRIGHT_BLUE = "\033[94m"
-    BRIGHT_MAGENTA = "\033[95m"
-    BRIGHT_CYAN = "\033[96m"
-    BRIGHT_GRAY = "\033[90m"
-    BRIGHT_WHITE = "\033[97m"
-    BOLD = "\033[1m"
-    UNDERLINE = "\033[4m"
-    INVERT = "\033[7m"
-    STRIKETHROUGH = "\033[9m"
-    BOLD_END = "\033[21m"
-    UNDERLINE_END = "\033[24m"
-    INVERT_END = "\033[27m"
-    STRIKETHROUGH_END = "\033[29m"
-    RESET = "\033[0m"
-
-
-# Patterns and their corresponding ANSI color codes
+# Shared Python worker process (created on first use)
+_python_worker = None
+
+# Whether the .env file has been loaded (deferred until an Agent is created)
+_dotenv_loaded = False
+
+
+def load_env():
+    """
+    Loads environment variables from the .env file once per process.
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+# Patterns and their corresponding ANSI color codes, in order of precedence: at
+# any position the first matching pattern wins, so comments and strings are
+# listed first and their contents are not highlighted any further
 HIGHLIGHT_PATTERNS = [
+    (
+        r"#.*",
+        GREEN,
+    ),  # Comments
+    (
+        r"(?s:\"\"\".*?\"\"\"|\'\'\'.*?\'\'\')",
+        RED,
+    ),  # Triple-quoted strings
+    (
+        r"(\".*?\"|\'.*?\')",
+        RED,
+    ),  # Single or double-quoted strings
     (
         r"\b(def|class|lambda|True|False|None)\b",
-        PrintStyle.BLUE.value,
+        BLUE,
     ),  # Keywords
     (
         r"\b(if|elif|else|try|except|finally|for|while|break|continue|return|import|from|as|pass|raise|with|yield|and|or|not|is|in)\b",
-        PrintStyle.MAGENTA.value,
+        MAGENTA,
     ),  # Keywords
     (
         r"\b(int|float|str|list|dict|set|tuple|bool|bytes|object|type|super|range|print|len|input|open|exec|eval|dir|vars|locals|globals|staticmethod|classmethod|property|Exception|BaseException|AssertionError|AttributeError|EOFError|FloatingPointError|GeneratorExit|ImportError|IndexError|KeyError|KeyboardInterrupt|MemoryError|NameError|NotImplementedError|OSError|OverflowError|ReferenceError|RuntimeError|StopIteration|SyntaxError|IndentationError|TabError|SystemError|SystemExit|TypeError|UnboundLocalError|ValueError|ZeroDivisionError)\b",
-        PrintStyle.GREEN.value,
+        GREEN,
     ),  # Built-in functions and exceptions
     (
-        r"(?<=\s|\.)[a-zA-Z_][a-zA-Z0-9_]*(?=\()",
-        PrintStyle.YELLOW.value,
+        r"(?<=[\s.])[a-zA-Z_][a-zA-Z0-9_]*(?=\()",
+        YELLOW,
     ),  # Catch all function calls
-    (
-        r"(\"\"\".*?\"\"\"|\'\'\'.*?\'\'\')",
-        PrintStyle.RED.value,
-    ),  # Triple-quoted strings
-    (
-        r"(\".*?\"|\'.*?\')",
-        PrintStyle.RED.value,
-    ),  # Single or double-quoted strings
-    (
-        r"#.*",
-        PrintStyle.GREEN.value,
-    ),  # Comments
     (
         r"\b([A-Z_][A-Z0-9_]*)\b",
-        PrintStyle.BOLD.value,
+        BOLD,
     ),  # Constants in uppercase
 ]
 
 
+# Matches ANSI style escape sequences such as those in styles.py
+ANSI_ESCAPE_REGEX = re.compile(r"\033\[[0-9;]*m")
+
+
 def remove_ansi_escape_sequences(text):
     """
     Removes ANSI escape sequences from a text.
@@ -110,62 +203,83 @@ def remove_ansi_escape_sequences(text):
     Returns:
         str: The text with ANSI escape sequences removed.
     """
-    return re.sub(r"\033\[[0-9;]*m", "", text)
+    # Most text has no escapes at all, so skip the regex engine for it
+    if "\033" not in text:
+        return text
+    return ANSI_ESCAPE_REGEX.sub("", text)
 
 
-# Function to apply highlighting to code
+# All patterns fused into one regex, so the code is scanned in a single pass
+HIGHLIGHT_REGEX = re.compile(
+    "|".join(
+        f"(?P<g{i}>{pattern})" for i, (pattern, _) in enumerate(HIGHLIGHT_PATTERNS)
+    )
+)
+HIGHLIGHT_COLORS = {f"g{i}": color for i, (_, color) in enumerate(HIGHLIGHT_PATTERNS)}
+
+
+# Function to apply highlighting to code, remembering recent results so the same
+# snippet shown again is not re-scanned
+@functools.lru_cache(maxsize=64)
 def highlight_code(code):
-    for pattern, color in HIGHLIGHT_PATTERNS:
-        code = re.sub(
-            pattern,
-            lambda match: f"{color}{remove_ansi_escape_sequences(match.group(0))}{PrintStyle.RESET.value}",
-            code,
-        )
-    return code
+    return HIGHLIGHT_REGEX.sub(
+        lambda match: f"{HIGHLIGHT_COLORS[match.lastgroup]}{match.group(0)}{RESET}",
+        code,
+    )
 
 
-# User's input style prefix
-USER_STYLE_PREFIX = f"{PrintStyle.BRIGHT_BLUE.value}"
+# Compiled .gitignore rules, keyed by the file's path, modification time and size
+_gitignore_cache = {}
 
 
 def load_gitignore_entries(use_gitignore):
     """
-    Loads entries from the .gitignore file if it exists.
+    Loads the rules from the .gitignore file if it exists.
 
     Args:
         use_gitignore (bool): Flag to indicate whether to read the .gitignore file.
 
     Returns:
-        set: A set of entries from the .gitignore file.
+        pathspec.GitIgnoreSpec | None: The compiled .gitignore rules, or None if there are none to apply.
+        The rules are only re-read when the file changes.
     """
-    gitignore_entries = set()
     if use_gitignore:
         gitignore_path = os.path.join(USER_CWD, ".gitignore")
-        if os.path.isfile(gitignore_path):
-            with open(gitignore_path, "r") as file:
-                gitignore_entries = {line.strip() for line in file}
-    return gitignore_entries
+        try:
+            file_stat = os.stat(gitignore_path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        key = (gitignore_path, file_stat.st_mtime_ns, file_stat.st_size)
+        if key not in _gitignore_cache:
+            with open(gitignore_path, "r", encoding="utf-8") as file:
+                lines = [
+                    line
+                    for line in file.read().splitlines()
+                    if line and not line.startswith("#")
+                ]
+            _gitignore_cache.clear()
+            _gitignore_cache[key] = (
+                pathspec.GitIgnoreSpec.from_lines(lines) if lines else None
+            )
+        return _gitignore_cache[key]
+    return None
 
 
-def is_excluded(item_path, gitignore_entries):
+def is_excluded(rel_path, gitignore_spec):
     """
-    Checks if a file/directory should be excluded based on .gitignore entries.
+    Checks if a file/directory should be excluded based on .gitignore rules.
 
     Args:
-        item_path (str): The path of the item to check.
-        gitignore_entries (set): A set of .gitignore entries.
+        rel_path (str): The path of the item relative to the current working directory, using "/" separators. Directories must end with "/".
+        gitignore_spec (pathspec.GitIgnoreSpec | None): The compiled .gitignore rules, if any.
 
     Returns:
         bool: True if the item should be excluded, False otherwise.
     """
-    rel_path = os.path.relpath(item_path, USER_CWD)
-    rel_path = os.path.normpath(rel_path).replace(os.sep, "/")
-    if rel_path in gitignore_entries or f"{rel_path}/" in gitignore_entries:
-        return True
-    return any(
-        entry.endswith("/") and rel_path.startswith(entry)
-        for entry in gitignore_entries
-    )
+    return gitignore_spec is not None and gitignore_spec.match_file(rel_path)
 
 
 def get_files_dirs(use_gitignore=True, ignore_all_hidden=False, max_depth=1):
@@ -180,38 +294,118 @@ def get_files_dirs(use_gitignore=True, ignore_all_hidden=False, max_depth=1):
     Returns:
         str: A formatted string representing the file tree.
     """
+    # (depth, text, is_dir, path) rows, formatted once at the end
     output = []
-    gitignore_entries = load_gitignore_entries(use_gitignore)
+    gitignore_spec = load_gitignore_entries(use_gitignore)
 
-    def tree(dir_path, indent="", current_depth=0):
-        if current_depth > max_depth:
-            return
+    def list_dir(dir_path, rel_prefix, depth):
+        try:
+            # scandir entries cache their file type, so is_dir() needs no extra stat
+            with os.scandir(dir_path) as entries:
+                dir_content = sorted(
+                    (
+                        entry
+                        for entry in entries
+                        if not entry.name.startswith(".git")
+                        and (not ignore_all_hidden or not entry.name.startswith("."))
+                    ),
+                    key=lambda entry: entry.name,
+                )
+        except PermissionError:
+            return [(depth, f"Permission denied: {dir_path}", False, dir_path)]
+
+        rows = []
+        for entry in dir_content:
+            rel_path = f"{rel_prefix}{entry.name}"
+            is_dir = entry.is_dir()
+            if not is_excluded(f"{rel_path}/" if is_dir else rel_path, gitignore_spec):
+                rows.append((depth, rel_path, is_dir, entry.path))
+        return rows
+
+    # Walk the tree depth-first from the current working directory, using an
+    # explicit stack (children pushed in reverse) instead of recursion
+    stack = list_dir(USER_CWD, "", 0) if max_depth >= 0 else []
+    stack.reverse()
+    while stack:
+        row = stack.pop()
+        output.append(row)
+        depth, rel_path, is_dir, path = row
+        if is_dir and depth < max_depth:
+            stack.extend(reversed(list_dir(path, f"{rel_path}/", depth + 1)))
+
+    return "\n".join(
+        f"{'  ' * depth}{text}{'/' if is_dir else ''}"
+        for depth, text, is_dir, _ in output
+    )
+
+
+def get_files_dirs_signature(max_depth=1):
+    """
+    Builds a cheap signature of the current working directory for caching its file tree.
+
+    The signature covers the modification times of the .gitignore file and of every
+    directory whose entries get_files_dirs() lists at the given depth, so it changes
+    whenever a shown entry is added or removed.
+
+    Args:
+        max_depth (int): Maximum depth of the directory tree to cover.
 
+    Returns:
+        tuple: The modification times making up the signature.
+    """
+    signature = [os.stat(USER_CWD).st_mtime_ns]
+    try:
+        signature.append(os.stat(os.path.join(USER_CWD, ".gitignore")).st_mtime_ns)
+    except FileNotFoundError:
+        signature.append(None)
+
+    # (path, relative path, depth) of the directories whose entries are listed
+    stack = [(USER_CWD, "", 0)] if max_depth >= 0 else []
+    while stack:
+        dir_path, rel_prefix, depth = stack.pop()
+        if depth >= max_depth:
+            continue
         try:
-            dir_content = [
-                item
-                for item in os.listdir(dir_path)
-                if not item.startswith(".git")
-                and (not ignore_all_hidden or not item.startswith("."))
-            ]
-            dir_content.sort()
-            for item in dir_content:
-                item_path = os.path.join(dir_path, item)
-                if not is_excluded(item_path, gitignore_entries):
-                    rel_path = os.path.relpath(item_path, USER_CWD)
-                    rel_path = os.path.normpath(rel_path).replace(os.sep, "/")
-                    if os.path.isdir(item_path):
-                        output.append(f"{indent}{rel_path}/")
-                        tree(item_path, indent + "  ", current_depth + 1)
-                    else:
-                        output.append(f"{indent}{rel_path}")
+            with os.scandir(dir_path) as entries:
+                subdirs = [
+                    entry
+                    for entry in entries
+                    if entry.is_dir() and not entry.name.startswith(".git")
+                ]
         except PermissionError:
-            output.append(f"{indent}Permission denied: {dir_path}")
+            continue
+        for entry in subdirs:
+            rel_path = f"{rel_prefix}{entry.name}"
+            signature.append((rel_path, entry.stat().st_mtime_ns))
+            stack.append((entry.path, f"{rel_path}/", depth + 1))
+    return tuple(signature[:2] + sorted(signature[2:]))
+
+
+@functools.lru_cache(maxsize=16)
+def _files_tree_cached(cwd, signature, use_gitignore, ignore_all_hidden, max_depth):
+    # The working directory and signature are only part of the cache key
+    return get_files_dirs(use_gitignore, ignore_all_hidden, max_depth)
+
 
-    # Start building the tree from the current working directory
-    tree(USER_CWD)
+def get_files_tree(use_gitignore=True, ignore_all_hidden=False, max_depth=1):
+    """
+    Returns the file tree from get_files_dirs(), only rebuilding it when the directory signature changes.
 
-    return "\n".join(output)
+    Args:
+        use_gitignore (bool): Whether to respect the .gitignore file.
+        ignore_all_hidden (bool): Whether to ignore all hidden files and directories.
+        max_depth (int): Maximum depth of the directory tree to traverse.
+
+    Returns:
+        str: A formatted string representing the file tree.
+    """
+    return _files_tree_cached(
+        USER_CWD,
+        get_files_dirs_signature(max_depth),
+        use_gitignore,
+        ignore_all_hidden,
+        max_depth,
+    )
 
 
 def write_file(file_path, content, append=False):
@@ -226,9 +420,7 @@ def write_file(file_path, content, append=False):
     Returns:
         str: A success message indicating that the file was written successfully.
     """
-    print(
-        f"{PrintStyle.BRIGHT_CYAN.value}Writing to file '{file_path}'...{PrintStyle.RESET.value}"
-    )
+    print(f"{BRIGHT_CYAN}Writing to file '{file_path}'...{RESET}")
     file_path = os.path.join(USER_CWD, file_path)
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -252,18 +444,133 @@ def read_file(file_path):
     Returns:
         str: The content of the file or an error message if the file is not found.
     """
-    print(
-        f"{PrintStyle.BRIGHT_CYAN.value}Reading file '{file_path}'...{PrintStyle.RESET.value}"
-    )
+    print(f"{BRIGHT_CYAN}Reading file '{file_path}'...{RESET}")
+    return load_file(file_path)
+
+
+def load_file(file_path):
+    """
+    Loads the content of a file for read_file() without printing, so it can run in a thread.
+
+    Args:
+        file_path (str): The path of the file to read (relative to the current working directory).
+
+    Returns:
+        str: The content of the file or an error message if the file is not found.
+    """
     file_path = os.path.join(USER_CWD, file_path)
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
+        # An unbuffered binary read sizes its buffer from fstat and fills it in one
+        # go, skipping the text layer's incremental decoding
+        with open(file_path, "rb", buffering=0) as file:
+            # Invalid bytes become U+FFFD rather than failing the whole read
+            content = file.readall().decode("utf-8", errors="replace")
+        # Match the universal newlines of a text mode read
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
         return f"Content of file '{file_path}':\n\n{content}"
     except FileNotFoundError:
         return f"Error: File '{file_path}' not found."
 
 
+class PythonWorker:
+    """A long-lived Python process that runs code for the python_executor tool."""
+
+    def __init__(self, python_path):
+        self.python_path = python_path
+        self.process = None
+
+    def start(self):
+        """
+        Starts the worker process if it isn't running.
+        """
+        if self.process is not None and self.process.poll() is None:
+            return
+        self.process = subprocess.Popen(
+            [self.python_path, "-u", PYTHON_WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+        )
+
+    def run(self, code):
+        """
+        Runs Python code in the worker, starting it first if needed.
+
+        Args:
+            code (str): The Python code to execute.
+
+        Returns:
+            tuple: The output of the code (str) and whether it ran without error (bool).
+        """
+        self.start()
+        try:
+            self.process.stdin.write(json.dumps({"code": code}) + "\n")
+            self.process.stdin.flush()
+            response = self.process.stdout.readline()
+        except BrokenPipeError:
+            response = ""
+        except BaseException:
+            # E.g. Ctrl+C while waiting: the worker's reply would be out of sync, so discard it
+            self.restart()
+            raise
+
+        if not response:
+            self.restart()
+            return "The Python process exited unexpectedly.", False
+        try:
+            result = json.loads(response)
+            return result["output"], result["success"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            # The replies can no longer be trusted to line up with the requests
+            self.restart()
+            return "The Python process sent an invalid response.", False
+
+    def restart(self):
+        """
+        Replaces the worker process with a fresh one, which starts importing the
+        common libraries while waiting for the next run.
+        """
+        self.close()
+        try:
+            self.start()
+        except OSError:
+            pass  # Reported by the next run, which tries to start it again
+
+    def close(self):
+        """
+        Stops the worker process if it is running.
+        """
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            self.process.stdin.close()
+            self.process.stdout.close()
+            self.process = None
+
+
+def get_python_worker():
+    """
+    Returns the shared Python worker, creating it on first use.
+
+    Returns:
+        PythonWorker: The worker that runs code with the project's virtual environment.
+    """
+    global _python_worker
+    if _python_worker is None:
+        abs_dir = os.path.abspath(os.path.dirname(__file__))
+        if USER_PLATFORM == "win32":
+            python_path = os.path.join(abs_dir, "venv", "Scripts", "python.exe")
+        else:
+            python_path = os.path.join(abs_dir, "venv", "bin", "python")
+        _python_worker = PythonWorker(python_path)
+        atexit.register(_python_worker.close)
+    return _python_worker
+
+
 def run_python_code(code):
     """
     Executes Python code and returns the output.
@@ -274,27 +581,155 @@ def run_python_code(code):
     Returns:
         str: The output of the Python code execution.
     """
-    print(
-        f"{PrintStyle.BRIGHT_CYAN.value}Executing Python code...{PrintStyle.RESET.value}"
+    print(f"{BRIGHT_CYAN}Executing Python code...{RESET}")
+    output, success = get_python_worker().run(code)
+    if not success:
+        return f"Error executing Python code:\n\n{output}"
+    return (
+        f"Python code executed successfully.\n\nOutput:\n\n{output}"
+        if output
+        else "Python code executed successfully."
     )
-    try:
-        abs_dir = os.path.abspath(os.path.dirname(__file__))
-        if USER_PLATFORM == "win32":
-            python_path = os.path.join(abs_dir, "venv", "Scripts", "python.exe")
-        else:
-            python_path = os.path.join(abs_dir, "venv", "bin", "python")
-        output = subprocess.check_output(
-            [python_path, "-c", code],
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-        return (
-            f"Python code executed successfully.\n\nOutput:\n\n{output}"
-            if output
-            else "Python code executed successfully."
-        )
-    except subprocess.CalledProcessError as e:
-        return f"Error executing Python code:\n\n{e.output}"
+
+
+def with_cache_breakpoint(messages):
+    """
+    Marks the end of the conversation as a prompt cache breakpoint for the Anthropic API.
+
+    Args:
+        messages (list): The conversation messages.
+
+    Returns:
+        list: The messages, with a copy of the last one whose final content block is marked for caching.
+    """
+    if not messages:
+        return messages
+    last_message = messages[-1]
+    content = last_message["content"]
+    if isinstance(content, str):
+        if not content:
+            return messages
+        content = [{"type": "text", "text": content}]
+    elif not content:
+        return messages
+    content = content[:-1] + [{**content[-1], "cache_control": {"type": "ephemeral"}}]
+    return messages[:-1] + [{**last_message, "content": content}]
+
+
+class ResponseCache:
+    """An on-disk cache of text-only AI responses, stored in SQLite."""
+
+    def __init__(self, path=RESPONSE_CACHE_FILE, ttl=RESPONSE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._connection = None
+
+    def connect(self):
+        """
+        Opens the cache database on first use, creating its table if needed.
+
+        Returns:
+            sqlite3.Connection: The open connection.
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+        return self._connection
+
+    def get(self, key):
+        """
+        Looks up a cached response.
+
+        Args:
+            key (str): The cache key of the request.
+
+        Returns:
+            str | None: The cached response, or None if there is no valid entry.
+        """
+        try:
+            row = (
+                self.connect()
+                .execute(
+                    "SELECT response FROM responses WHERE key = ? AND created > ?",
+                    (key, time.time() - self.ttl),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def set(self, key, response):
+        """
+        Stores a response, dropping any expired entries.
+
+        Args:
+            key (str): The cache key of the request.
+            response (str): The response text.
+        """
+        now = time.time()
+        try:
+            connection = self.connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, response, now),
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE created <= ?", (now - self.ttl,)
+                )
+        except sqlite3.Error:
+            pass
+
+
+class StreamPrinter:
+    """Buffers streamed text and writes it to the console in batches."""
+
+    # Chunk endings that mark a natural point to show the buffered text
+    FLUSH_ENDINGS = ("\n", " ", ".", ",")
+
+    def __init__(self, flush_size=64, flush_interval=0.016):
+        # Bound once so each streamed chunk avoids the attribute lookups
+        self._write = sys.stdout.write
+        self._flush = sys.stdout.flush
+        self._buffer = []
+        self._buffer_size = 0
+        self._last_flush = 0.0
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+    def write(self, text):
+        """
+        Buffers text, writing it out on a newline, once enough has accumulated, or at
+        a word boundary when no write has happened for flush_interval seconds.
+
+        Args:
+            text (str): The text to print.
+        """
+        self._buffer.append(text)
+        self._buffer_size += len(text)
+        if (
+            self._buffer_size >= self.flush_size
+            or "\n" in text
+            or (
+                text.endswith(self.FLUSH_ENDINGS)
+                and time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        ):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes out any buffered text.
+        """
+        if self._buffer:
+            self._write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffer_size = 0
+            self._flush()
+            self._last_flush = time.monotonic()
 
 
 class Agent:
@@ -313,32 +748,90 @@ class Agent:
         use_memory=False,
         view_list_dir=False,
         always_allow=False,
+        use_cache=False,
     ) -> None:
+        load_env()
+
         self.model = model if model else "gpt-4o"
         if self.model.startswith("claude"):
             self.api = "anthropic"
+            # Imported here so that the Anthropic SDK is only loaded when needed
+            from anthropic import Anthropic
+
             self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
         elif self.model.startswith("gpt"):
             self.api = "openai"
+            # Imported here so that the OpenAI SDK is only loaded when needed
+            from openai import OpenAI
+
             self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 
         self.chat = []
 
         self.use_memory = use_memory
 
+        # Reuses earlier answers to identical requests, when enabled
+        self.response_cache = ResponseCache() if use_cache else None
+
         self.view_list_dir = view_list_dir
         self.always_allow = always_allow
 
-        self.system_prompt = (
-            f"Your primary function is to assist the user with tasks related to terminal commands in their respective platform. You can also help with code and other queries. Information about the user's platform, environment, and current working directory is provided below.\n\n{USER_INFO}"
-            + "\n\nTool Calls:\nIf you're asked to perform a task that requires writing to the file system, reading from a file, or executing Python code, use the tool directly to perform the task. Do not ask for permission first. Perform any tasks that require a tool call immediately, without responding to the user first, unless absolutely necessary for clarification."
-        )
+        self.system_prompt = SYSTEM_PROMPT
+
+        # The instructions in the API's format, built once as they never change
+        if self.api == "anthropic":
+            self._system_block = {
+                "type": "text",
+                "text": self.system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        elif self.api == "openai":
+            self._system_block = {"role": "system", "content": self.system_prompt}
+
+        # Tools formatted for the API once, with and without the memory tools
+        self._tools = [self.format_tool(tool) for tool in BASE_TOOLS]
+        self._tools_with_memory = self._tools + [
+            self.format_tool(tool) for tool in MEMORY_TOOLS
+        ]
 
         self._failed_tool_calls = 0
 
+        # Functions executing each tool from its decoded arguments
+        self._tool_handlers = {
+            "file_writer": lambda args: write_file(
+                args["file_path"], args["content"], bool(args["append"])
+            ),
+            "file_reader": lambda args: read_file(args["file_path"]),
+            "python_executor": lambda args: run_python_code(args["code"]),
+            "save_memory": self._save_memory_tool,
+            "remove_memory": self._remove_memory_tool,
+        }
+
+        # Runs independent tool calls, such as consecutive file reads, concurrently
+        self._tool_executor = ThreadPoolExecutor(max_workers=8)
+
+        # Memory items, read from the memory file and re-read whenever another session changes it
+        self._memories = None
+        self._memories_size = 0  # Total length of the memory items
+        # Memory file signature when this agent last read or wrote it
+        self._memory_file_signature = None
+        self._memory_changes = []  # Changes not yet written, as (action, item, index)
+        # Make sure changes made just before exiting still reach the memory file
+        atexit.register(self.flush_memory)
+
+        # Start the Python worker now so the libraries it imports ahead of time are
+        # ready by the first python_executor call
+        try:
+            get_python_worker().start()
+        except OSError:
+            pass  # Reported by the first run, which tries to start it again
+
+        # Last payload written to the memory file
+        self._last_memory_payload = None
+
     def is_valid_tool_call(self, tool_call):
         """
-        Checks if a tool call is valid.
+        Checks if a tool call is valid, storing its decoded arguments under "args".
 
         Args:
             tool_call (dict): Tool call information.
@@ -347,59 +840,32 @@ class Agent:
             bool: True if the tool call is valid, False otherwise.
             str: An error message if the tool call is invalid.
         """
-        if tool_call["tool_name"] not in [
-            "file_writer",
-            "file_reader",
-            "python_executor",
-            "save_memory",
-            "remove_memory",
-        ]:
+        if tool_call["tool_name"] not in TOOL_REQUIRED_ARGS:
             return (
                 False,
                 "Invalid tool name. The tool name must be one of 'file_writer', 'file_reader', 'python_executor', 'save_memory', or 'remove_memory'.",
             )
 
-        try:
-            if self.api == "anthropic":
-                args = tool_call["args_json"]
-            elif self.api == "openai":
-                args = json.loads(tool_call["args_json"])
-        except:
+        # Decode the arguments here once and keep them for the later steps
+        if "args" not in tool_call:
+            try:
+                tool_call["args"] = _json_loads(tool_call["args_json"])
+            except json.JSONDecodeError:
+                return (
+                    False,
+                    "Error decoding arguments. Ensure the arguments are in valid JSON format.",
+                )
+        args = tool_call["args"]
+
+        if not isinstance(args, dict):
             return (
                 False,
                 "Error decoding arguments. Ensure the arguments are in valid JSON format.",
             )
 
-        if tool_call["tool_name"] == "file_writer":
-            if "file_path" not in args or "content" not in args or "append" not in args:
-                return (
-                    False,
-                    "Missing required arguments. 'file_path', 'content' and 'append' are required arguments for the 'file_writer' tool. If you receive this error repeatedly, it may be because the content is too large. Try reducing the content size - you can break it up into multiple tool calls if necessary.",
-                )
-        elif tool_call["tool_name"] == "file_reader":
-            if "file_path" not in args:
-                return (
-                    False,
-                    "Missing required argument. 'file_path' is a required argument for the 'file_reader' tool.",
-                )
-        elif tool_call["tool_name"] == "python_executor":
-            if "code" not in args:
-                return (
-                    False,
-                    "Missing required argument. 'code' is a required argument for the 'python_executor' tool. If you receive this error repeatedly, it may be because the code is too large. Try reducing the code size.",
-                )
-        elif tool_call["tool_name"] == "save_memory":
-            if "content" not in args:
-                return (
-                    False,
-                    "Missing required argument. 'content' is a required argument for the 'save_memory' tool.",
-                )
-        elif tool_call["tool_name"] == "remove_memory":
-            if "index" not in args:
-                return (
-                    False,
-                    "Missing required argument. 'index' is a required argument for the 'remove_memory' tool.",
-                )
+        required_args, missing_args_message = TOOL_REQUIRED_ARGS[tool_call["tool_name"]]
+        if not required_args <= args.keys():
+            return False, missing_args_message
 
         return True, ""
 
@@ -414,31 +880,28 @@ class Agent:
             str: A formatted message describing the tool call.
         """
         tool_name = tool_call["tool_name"]
-        if self.api == "anthropic":
-            args = tool_call["args_json"]
-        elif self.api == "openai":
-            args = json.loads(tool_call["args_json"])
+        args = tool_call["args"]
 
         if tool_name == "file_writer":
             file_name = args["file_path"]
             content = args["content"]
             append = bool(args["append"])
             if append:
-                return f"{PrintStyle.WHITE.value}{content}\n\n{PrintStyle.BRIGHT_CYAN.value}GPT wants to append the content to the file '{file_name}'.{PrintStyle.RESET.value}"
+                return f"{WHITE}{content}\n\n{BRIGHT_CYAN}GPT wants to append the content to the file '{file_name}'.{RESET}"
             else:
-                return f"{PrintStyle.WHITE.value}{content}\n\n{PrintStyle.BRIGHT_CYAN.value}GPT wants to create the file '{file_name}' with this content.{PrintStyle.RESET.value}"
+                return f"{WHITE}{content}\n\n{BRIGHT_CYAN}GPT wants to create the file '{file_name}' with this content.{RESET}"
         elif tool_name == "file_reader":
             file_name = args["file_path"]
-            return f"{PrintStyle.BRIGHT_CYAN.value}GPT wants to open and read '{file_name}'.{PrintStyle.RESET.value}"
+            return f"{BRIGHT_CYAN}GPT wants to open and read '{file_name}'.{RESET}"
         elif tool_name == "python_executor":
             code = highlight_code(args["code"])
-            return f"{code}\n\n{PrintStyle.BRIGHT_CYAN.value}GPT wants to execute the above Python code.{PrintStyle.RESET.value}"
+            return f"{code}\n\n{BRIGHT_CYAN}GPT wants to execute the above Python code.{RESET}"
         elif tool_name == "save_memory":
             content = args["content"]
-            return f"{PrintStyle.WHITE.value}{content}\n\n{PrintStyle.BRIGHT_CYAN.value}GPT wants to store this information in memory for future reference.{PrintStyle.RESET.value}"
+            return f"{WHITE}{content}\n\n{BRIGHT_CYAN}GPT wants to store this information in memory for future reference.{RESET}"
         elif tool_name == "remove_memory":
             index = args["index"]
-            return f"{PrintStyle.BRIGHT_CYAN.value}GPT wants to remove the memory item at index {index}.{PrintStyle.RESET.value}"
+            return f"{BRIGHT_CYAN}GPT wants to remove the memory item at index {index}.{RESET}"
         else:
             return ""
 
@@ -452,34 +915,61 @@ class Agent:
         Returns:
             str: The result of the tool execution.
         """
-        tool_name = tool_call["tool_name"]
-        if self.api == "anthropic":
-            args = tool_call["args_json"]
-        elif self.api == "openai":
-            args = json.loads(tool_call["args_json"])
-        if tool_name == "file_writer":
-            file_name = args["file_path"]
-            content = args["content"]
-            append = bool(args["append"])
-            result = write_file(file_name, content, append)
-        elif tool_name == "file_reader":
-            file_name = args["file_path"]
-            result = read_file(file_name)
-        elif tool_name == "python_executor":
-            code = args["code"]
-            result = run_python_code(code)
-        elif tool_name == "save_memory":
-            content = args["content"]
-            self.save_memory(content)
-            result = f"Stored in memory: {content}"
-        elif tool_name == "remove_memory":
-            index = args["index"]
-            self.remove_memory(index)
-            result = f"Removed memory item at index {index}."
-        else:
+        handler = self._tool_handlers.get(tool_call["tool_name"])
+        if handler is None:
             return ""
+        return handler(tool_call["args"])
+
+    def _save_memory_tool(self, args):
+        """
+        Runs the save_memory tool.
+
+        Args:
+            args (dict): The decoded tool arguments.
+
+        Returns:
+            str: The result of the tool execution.
+        """
+        content = args["content"]
+        self.save_memory(content)
+        return f"Stored in memory: {content}"
+
+    def _remove_memory_tool(self, args):
+        """
+        Runs the remove_memory tool.
+
+        Args:
+            args (dict): The decoded tool arguments.
+
+        Returns:
+            str: The result of the tool execution.
+        """
+        index = args["index"]
+        self.remove_memory(index)
+        return f"Removed memory item at index {index}."
+
+    def start_file_reads(self, tool_calls):
+        """
+        Starts reading the files of consecutive file_reader calls concurrently.
+
+        Args:
+            tool_calls (list): The tool calls still to be processed, in order.
 
-        return result
+        Returns:
+            dict: Futures for the tool results, keyed by tool call ID. Only the file I/O
+                runs in the pool; the status lines are printed when collecting the results.
+        """
+        file_reads = {}
+        for tool_call in tool_calls:
+            if (
+                tool_call["tool_name"] != "file_reader"
+                or not self.is_valid_tool_call(tool_call)[0]
+            ):
+                break
+            file_reads[tool_call["tool_call_id"]] = self._tool_executor.submit(
+                load_file, tool_call["args"]["file_path"]
+            )
+        return file_reads
 
     def format_tool(self, tool):
         """
@@ -511,14 +1001,24 @@ class Agent:
             None
         """
 
-        while (
-            len(json.dumps(self.chat)) > MAX_CHAT_TOTAL_CONTENT
-            or self.chat[0]["role"] != "user"
+        # Serialize each message once; json.dumps(self.chat) is the sum of these
+        # plus "[", "]" and a ", " separator between messages
+        message_sizes = [len(json.dumps(message)) for message in self.chat]
+        total_size = sum(message_sizes) + 2 * len(message_sizes)
+
+        abridged_count = 0
+        while abridged_count < len(self.chat) and (
+            total_size > MAX_CHAT_TOTAL_CONTENT
+            or self.chat[abridged_count]["role"] != "user"
         ):
+            total_size -= message_sizes[abridged_count] + 2
+            abridged_count += 1
+
+        if abridged_count:
             print(
-                f"{PrintStyle.BRIGHT_YELLOW.value}Max chat content exceeded or first message not from user. Abridging chat...{PrintStyle.RESET.value}"
+                f"{BRIGHT_YELLOW}Max chat content exceeded or first message not from user. Abridging chat...{RESET}"
             )
-            self.chat.pop(0)
+            del self.chat[:abridged_count]
 
     def run(self, query: str = "") -> None:
         """
@@ -529,59 +1029,79 @@ class Agent:
         """
         if query != "":
             self.chat.append({"role": "user", "content": query})
-        full_system_prompt = f"""{self.system_prompt}"""
+        # The instructions stay identical between turns, so they form a prefix the
+        # providers can cache; the file tree and memories change and are sent after them
+        context_parts = []
 
         if self.view_list_dir:
-            files_tree = get_files_dirs()
-            full_system_prompt += f"\n\nHere's a list of files and directories in the current working directory:\n\n{files_tree}"
+            context_parts.append(
+                f"Here's a list of files and directories in the current working directory:\n\n{get_files_tree()}\n\n"
+            )
 
         if self.use_memory:
-            memories = self.load_memory()
+            memories = self.memories
             if memories:
-                full_system_prompt += f"\n\nMemories:\n\n"
-                for i, memory in enumerate(memories):
-                    full_system_prompt += f"#{i} -> {memory}\n\n"
+                context_parts.append("Memories:\n\n")
+                context_parts.extend(
+                    f"#{i} -> {memory}\n\n" for i, memory in enumerate(memories)
+                )
+        context_prompt = "".join(context_parts)
 
         self.abridge_chat()
 
         _messages = self.chat
 
+        if self.response_cache is not None:
+            # Everything that shapes the response goes into the key
+            cache_key = hashlib.blake2b(
+                SYSTEM_PROMPT_HASH
+                + _json_dumps([self.model, self.use_memory, context_prompt, _messages]),
+                digest_size=16,
+            ).hexdigest()
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                print(cached_response, flush=True)
+                if self.api == "anthropic":
+                    self.chat.append(
+                        {
+                            "role": "assistant",
+                            "content": [{"type": "text", "text": cached_response}],
+                        }
+                    )
+                elif self.api == "openai":
+                    self.chat.append({"role": "assistant", "content": cached_response})
+                return
+
         @retry(
             wait=wait_random_exponential(min=2, max=60),
             stop=stop_after_attempt(3),
             after=lambda retry_state: print(
-                f"{PrintStyle.BRIGHT_YELLOW.value}⚠ Unable to get response. Trying again... (Attempt {retry_state.attempt_number}/3){PrintStyle.RESET.value}"
+                f"{BRIGHT_YELLOW}⚠ Unable to get response. Trying again... (Attempt {retry_state.attempt_number}/3){RESET}"
             ),
             reraise=True,
         )
         def get_stream():
-            tools = [
-                self.format_tool(FILE_WRITER_TOOL),
-                self.format_tool(FILE_READER_TOOL),
-                self.format_tool(PYTHON_EXECUTOR_TOOL),
-            ]
-            if self.use_memory:
-                tools.append(self.format_tool(SAVE_MEMORY_TOOL))
-                tools.append(self.format_tool(REMOVE_MEMORY_TOOL))
+            tools = self._tools_with_memory if self.use_memory else self._tools
 
             if self.api == "anthropic":
+                system = [self._system_block]
+                if context_prompt:
+                    system.append({"type": "text", "text": context_prompt})
                 stream = self.client.messages.stream(
                     max_tokens=self.max_output_tokens,
-                    system=full_system_prompt,
-                    messages=_messages,
+                    system=system,
+                    messages=with_cache_breakpoint(_messages),
                     model=self.model,
                     tools=tools,
+                    extra_headers=ANTHROPIC_PROMPT_CACHING_HEADERS,
                 )
             elif self.api == "openai":
+                system = [self._system_block]
+                if context_prompt:
+                    system.append({"role": "system", "content": context_prompt})
                 stream = self.client.chat.completions.create(
                     max_tokens=self.max_output_tokens,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": full_system_prompt,
-                        }
-                    ]
-                    + _messages,
+                    messages=system + _messages,
                     model=self.model,
                     tools=tools,
                     stream=True,
@@ -591,22 +1111,23 @@ class Agent:
         try:
             stream = get_stream()
         except Exception as e:
-            print(
-                f"{PrintStyle.BRIGHT_RED.value}⚠ Error getting response: {e}{PrintStyle.RESET.value}"
-            )
+            print(f"{BRIGHT_RED}⚠ Error getting response: {e}{RESET}")
             return
 
-        text_stream_content = ""
+        text_chunks = []
+        printer = StreamPrinter()
         tool_calls = {}
         tool_call_detected = False
 
         if self.api == "anthropic":
             with stream as claude_stream:
                 for text in claude_stream.text_stream:
-                    text = text if text_stream_content else text.strip()
+                    text = text if text_chunks else text.strip()
                     if text:
-                        text_stream_content += text
-                        print(text, end="", flush=True)
+                        text_chunks.append(text)
+                        printer.write(text)
+                printer.flush()
+                text_stream_content = "".join(text_chunks)
 
                 final_message_content = claude_stream.get_final_message().content
                 tool_uses = [
@@ -614,6 +1135,7 @@ class Agent:
                         "tool_call_id": content.id,
                         "tool_name": content.name,
                         "args_json": content.input,
+                        "args": content.input,
                     }
                     for content in final_message_content
                     if content.type == "tool_use"
@@ -654,27 +1176,35 @@ class Agent:
                     for tool_call in chunk.choices[0].delta.tool_calls:
                         tool_call_detected = True
                         if tool_call.index not in tool_calls:
-                            if len(text_stream_content) > 0:
+                            printer.flush()
+                            if text_chunks:
                                 print("", flush=True)
                             print(
-                                f"{PrintStyle.BRIGHT_CYAN.value}Creating {tool_call.function.name} tool call...{PrintStyle.RESET.value}",
+                                f"{BRIGHT_CYAN}Creating {tool_call.function.name} tool call...{RESET}",
                                 flush=True,
                             )
                             tool_calls[tool_call.index] = {
                                 "tool_call_id": tool_call.id,
                                 "tool_name": tool_call.function.name,
-                                "args_json": "",
+                                "args_parts": [],
                             }
 
-                        tool_calls[tool_call.index][
-                            "args_json"
-                        ] += tool_call.function.arguments
+                        tool_calls[tool_call.index]["args_parts"].append(
+                            tool_call.function.arguments
+                        )
 
                 text = chunk.choices[0].delta.content
                 if text:
-                    text = text if text_stream_content else text.strip()
-                    text_stream_content += text
-                    print(text, end="", flush=True)
+                    text = text if text_chunks else text.strip()
+                    if text:
+                        text_chunks.append(text)
+                        printer.write(text)
+            printer.flush()
+            text_stream_content = "".join(text_chunks)
+
+            # Join each tool call's streamed argument fragments once
+            for tool_call in tool_calls.values():
+                tool_call["args_json"] = "".join(tool_call.pop("args_parts"))
 
             response_message = {
                 "role": "assistant",
@@ -699,36 +1229,61 @@ class Agent:
 
         self.chat.append(response_message)
 
+        # Only plain answers are cached; tool calls must always run for real
+        if (
+            self.response_cache is not None
+            and not tool_call_detected
+            and text_stream_content
+        ):
+            self.response_cache.set(cache_key, text_stream_content)
+
         if tool_call_detected:
             has_failed = (
                 False  # Flag to indicate if a tool call has failed at least once
             )
-            for index, tool_call in tool_calls.items():
+            # File reads started ahead of their turn, keyed by tool call ID
+            file_reads = {}
+            pending_tool_calls = list(tool_calls.values())
+            for position, tool_call in enumerate(pending_tool_calls):
                 valid_tool_call, error_message = self.is_valid_tool_call(tool_call)
                 if valid_tool_call:
                     self._failed_tool_calls = 0
 
                     if not self.always_allow:
                         print(
-                            f"{PrintStyle.BRIGHT_CYAN.value}{self.get_tool_call_message(tool_call)}{PrintStyle.RESET.value}",
+                            f"{BRIGHT_CYAN}{self.get_tool_call_message(tool_call)}{RESET}",
                             end=" ",
                         )
                         tool_confirmation = input(
-                            f"{PrintStyle.BRIGHT_MAGENTA.value}Allow?\n[y or yes to confirm else cancel with optional message]: {PrintStyle.RESET.value}"
+                            f"{BRIGHT_MAGENTA}Allow?\n[y or yes to confirm else cancel with optional message]: {RESET}"
                         )
                     if self.always_allow or tool_confirmation.lower() in ["y", "yes"]:
                         try:
-                            tool_result = self.process_tool_call(tool_call)
-                            if tool_result:
-                                text_stream_content += f"\n\n{tool_result}"
-
-                            if tool_result.startswith("Error"):
+                            # Reads don't depend on each other, so when no confirmation is
+                            # needed a run of them is read concurrently
+                            if (
+                                self.always_allow
+                                and tool_call["tool_name"] == "file_reader"
+                                and tool_call["tool_call_id"] not in file_reads
+                            ):
+                                file_reads = self.start_file_reads(
+                                    pending_tool_calls[position:]
+                                )
+                            if tool_call["tool_call_id"] in file_reads:
                                 print(
-                                    f"{PrintStyle.BRIGHT_YELLOW.value}⚠ Something went wrong.{PrintStyle.RESET.value}"
+                                    f"{BRIGHT_CYAN}Reading file '{tool_call['args']['file_path']}'...{RESET}"
                                 )
+                                tool_result = file_reads.pop(
+                                    tool_call["tool_call_id"]
+                                ).result()
+                            else:
+                                tool_result = self.process_tool_call(tool_call)
+
+                            if tool_result.startswith("Error"):
+                                print(f"{BRIGHT_YELLOW}⚠ Something went wrong.{RESET}")
                             else:
                                 print(
-                                    f"{PrintStyle.BRIGHT_GREEN.value}✔ Tool executed successfully.{PrintStyle.RESET.value}"
+                                    f"{BRIGHT_GREEN}✔ Tool executed successfully.{RESET}"
                                 )
 
                             if self.api == "anthropic":
@@ -759,9 +1314,7 @@ class Agent:
                                     }
                                 )
                         except Exception as e:
-                            print(
-                                f"{PrintStyle.BRIGHT_RED.value}⚠ Error executing tool: {e}{PrintStyle.RESET.value}"
-                            )
+                            print(f"{BRIGHT_RED}⚠ Error executing tool: {e}{RESET}")
 
                             if self.api == "anthropic":
                                 self.chat.append(
@@ -790,7 +1343,7 @@ class Agent:
                                 )
                     else:
                         print(
-                            f"{PrintStyle.BRIGHT_YELLOW.value}✖ Cancelled {tool_call['tool_name']}.{PrintStyle.RESET.value}"
+                            f"{BRIGHT_YELLOW}✖ Cancelled {tool_call['tool_name']}.{RESET}"
                         )
 
                         if self.api == "anthropic":
@@ -836,7 +1389,7 @@ class Agent:
                             has_failed = True
 
                         print(
-                            f"{PrintStyle.BRIGHT_YELLOW.value}⚠ Error using {tool_call['tool_name']} tool. Trying again... (Attempt {self._failed_tool_calls}/3){PrintStyle.RESET.value}"
+                            f"{BRIGHT_YELLOW}⚠ Error using {tool_call['tool_name']} tool. Trying again... (Attempt {self._failed_tool_calls}/3){RESET}"
                         )
                         if self.api == "anthropic":
                             self.chat.append(
@@ -863,7 +1416,7 @@ class Agent:
                             )
                     else:
                         print(
-                            f"{PrintStyle.BRIGHT_RED.value}⚠ Unable to use {tool_call['tool_name']} tool. Maximum attempts reached.{PrintStyle.RESET.value}"
+                            f"{BRIGHT_RED}⚠ Unable to use {tool_call['tool_name']} tool. Maximum attempts reached.{RESET}"
                         )
                         if self.api == "anthropic":
                             self.chat.append(
@@ -889,6 +1442,9 @@ class Agent:
                                 }
                             )
 
+        # Write the memory changes from this turn's tool calls once
+        self.flush_memory()
+
         if tool_call_detected:
             self.run()
 
@@ -897,34 +1453,106 @@ class Agent:
         Loads the conversation memory from a file.
         """
         if os.path.exists(MEMORY_FILE):
-            with open(MEMORY_FILE, "r") as f:
-                memories = json.load(f)
+            with open(MEMORY_FILE, "rb") as f:
+                memories = _json_loads(f.read())
                 if isinstance(memories, list):
                     if len(memories) > 0:
                         if isinstance(memories[0], str):
                             return memories
         return []
 
+    def memory_file_signature(self):
+        """
+        Returns the modification time and size of the memory file, or None if it doesn't exist.
+        """
+        try:
+            file_stat = os.stat(MEMORY_FILE)
+        except FileNotFoundError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+
+    @property
+    def memories(self) -> list:
+        """
+        Returns the memory items, re-reading the memory file if it changed since this agent last read or wrote it.
+        """
+        signature = self.memory_file_signature()
+        if self._memories is None or signature != self._memory_file_signature:
+            self._memories = self.load_memory()
+            self._memories_size = sum(map(len, self._memories))
+            self._memory_file_signature = signature
+            # The file no longer holds what this agent last wrote
+            self._last_memory_payload = None
+            # Apply the changes not yet written on top of the other session's items
+            for action, memory, index in self._memory_changes:
+                self.apply_memory_change(action, memory, index)
+        return self._memories
+
+    def apply_memory_change(self, action, memory, index=None) -> None:
+        """
+        Applies a change to the in-memory memory items.
+
+        Args:
+            action (str): Either "save" to add the item or "remove" to remove it.
+            memory (str): The memory item.
+            index (int): Index the item was removed from. If the reloaded items no longer
+                hold it there, the first item with the same value is removed instead.
+        """
+        memories = self._memories
+        if action == "save":
+            # Drop the oldest items until the new one fits, tracking the total length
+            # as we go rather than re-joining the items on every check
+            self._memories_size += len(memory)
+            while memories and self._memories_size > 4096:
+                self._memories_size -= len(memories.pop(0))
+            memories.append(memory)
+        elif index is not None and index < len(memories) and memories[index] == memory:
+            self._memories_size -= len(memories.pop(index))
+        elif memory in memories:
+            memories.remove(memory)
+            self._memories_size -= len(memory)
+
     def save_memory(self, memory) -> None:
         """
-        Saves the conversation memory to a file.
+        Saves an item to the conversation memory, to be written to the memory file by flush_memory().
         """
-        memories = self.load_memory()
-        while len("".join(memories + [memory])) > 4096:
-            memories.pop(0)
-        memories.append(memory)
-        with open(MEMORY_FILE, "w") as f:
-            json.dump(memories, f)
+        self.memories  # Pick up changes made by other sessions first
+        self.apply_memory_change("save", memory)
+        self._memory_changes.append(("save", memory, None))
 
     def remove_memory(self, index) -> None:
         """
-        Removes a memory item from the conversation memory.
+        Removes a memory item from the conversation memory, to be written to the memory file by flush_memory().
         """
-        memories = self.load_memory()
+        memories = self.memories
         if index < len(memories):
-            memories.pop(index)
-            with open(MEMORY_FILE, "w") as f:
-                json.dump(memories, f)
+            memory = memories.pop(index)
+            self._memories_size -= len(memory)
+            self._memory_changes.append(("remove", memory, index))
+
+    def flush_memory(self) -> None:
+        """
+        Writes the memory items to the memory file if they changed since the last write.
+        """
+        if self._memory_changes:
+            # Re-reads the file first if another session changed it, so its items aren't overwritten
+            self.write_memory(self.memories)
+            self._memory_file_signature = self.memory_file_signature()
+            self._memory_changes.clear()
+
+    def write_memory(self, memories) -> None:
+        """
+        Atomically writes the memory items to the memory file, skipping the write if nothing changed since the last one.
+        """
+        payload = _json_dumps(memories)
+        if payload == self._last_memory_payload:
+            return
+        # Write to a temporary file first so an interrupted write can't corrupt the memory file
+        tmp_path = f"{MEMORY_FILE}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, MEMORY_FILE)
+        self._last_memory_payload = payload
 
     @property
     def max_output_tokens(self) -> int:
@@ -1035,3 +1663,31 @@ REMOVE_MEMORY_TOOL = {
         },
     },
 }
+
+# Tools offered to the model, plus the memory tools when memory is enabled
+BASE_TOOLS = (FILE_WRITER_TOOL, FILE_READER_TOOL, PYTHON_EXECUTOR_TOOL)
+MEMORY_TOOLS = (SAVE_MEMORY_TOOL, REMOVE_MEMORY_TOOL)
+
+# Required arguments for each tool, with the error returned when any are missing
+TOOL_REQUIRED_ARGS = {
+    "file_writer": (
+        frozenset({"file_path", "content", "append"}),
+        "Missing required arguments. 'file_path', 'content' and 'append' are required arguments for the 'file_writer' tool. If you receive this error repeatedly, it may be because the content is too large. Try reducing the content size - you can break it up into multiple tool calls if necessary.",
+    ),
+    "file_reader": (
+        frozenset({"file_path"}),
+        "Missing required argument. 'file_path' is a required argument for the 'file_reader' tool.",
+    ),
+    "python_executor": (
+        frozenset({"code"}),
+        "Missing required argument. 'code' is a required argument for the 'python_executor' tool. If you receive this error repeatedly, it may be because the code is too large. Try reducing the code size.",
+    ),
+    "save_memory": (
+        frozenset({"content"}),
+        "Missing required argument. 'content' is a required argument for the 'save_memory' tool.",
+    ),
+    "remove_memory": (
+        frozenset({"index"}),
+        "Missing required argument. 'index' is a required argument for the 'remove_memory' tool.",
+    ),
+}